@@ -1,21 +1,55 @@
-from contextlib import redirect_stderr, contextmanager
-import codecs
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr
 import mmap
 import io
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Tuple, Iterator, Dict, BinaryIO
 import datetime
+import functools
 import csv
 import os
+import re
+import threading
 
 import pandas as pd
-from pandas.io.parsers import TextFileReader
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pa_compute
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+_CSV_OPTIONS = {"encoding": "UTF-8", "skipinitialspace": True, "on_bad_lines": "warn"}
+# values read_csv treats as missing by default
+_PANDAS_NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>",
+                     "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+# a block starts with a header line "$NAME:ATTR1;ATTR2;...", the first one may directly follow the BOM
+# and ends with a comment line starting with "*", see _find_block_end
+_HEADER_RE = re.compile(rb'(?m)^(?:\xef\xbb\xbf)?\$([^:;\n]+):([^\n]*)')
+
+_WRITE_BUFFER_SIZE = 1 << 20
+_WRITE_CHUNK_SIZE = 65536
+
+# buffer for the stderr output of pandas, see _read_csv_file
+_std_err_log = io.StringIO()
+_std_err_lock = threading.Lock()
+
+# characters which cannot be written within string values of a Visum file
+_VISUM_CHAR_TABLE = str.maketrans({"$": "§", ";": ","})
+
+# attribute codes of user defined tables, read once per table name
+_attr_code_cache: Dict[str, List[str]] = {}
 
 
 def read_user_defined_table(visum, msg_prefix: str, table_name: str, attributes: Optional[list] = None, column_names: Optional[list] = None) -> pd.DataFrame:
     table = visum.Net.TableDefinitions.ItemByKey(table_name).TableEntries
 
     if not attributes:
-        attributes = [attribute.Code for attribute in table.Attributes.GetAll]
+        attributes = _attr_code_cache.get(table_name)
+        if attributes is None:
+            attributes = [attribute.Code for attribute in table.Attributes.GetAll]
+            _attr_code_cache[table_name] = attributes
 
     if not column_names:
         column_names = attributes
@@ -25,6 +59,14 @@ def read_user_defined_table(visum, msg_prefix: str, table_name: str, attributes:
     return df_udt
 
 
+def clear_attribute_cache():
+    """
+    Clears the cached attribute codes of user defined tables, e.g. after attributes were added or removed in Visum.
+    :return:
+    """
+    _attr_code_cache.clear()
+
+
 def update_visum_table(visum, msg_prefix: str, table_name: str, dataframe: pd.DataFrame, attributes: Optional[list] = None, remove_entries=False):
     table = visum.Net.TableDefinitions.ItemByKey(table_name)
     visum.Log(20480, f"{msg_prefix}: Updating table: {table_name}. Erasing results: {remove_entries}")
@@ -36,14 +78,19 @@ def update_visum_table(visum, msg_prefix: str, table_name: str, dataframe: pd.Da
     if not attributes:
         attributes = dataframe.columns
 
-    table.TableEntries.SetMultipleAttributes(attributes, dataframe.values.tolist())
+    # row tuples keep the native python type of each column, unlike the upcast values of dataframe.values
+    table.TableEntries.SetMultipleAttributes(attributes, list(dataframe.itertuples(index=False, name=None)))
 
 
-def read_visum_file(path: str, block_names: Optional[Union[List, str]], **kwargs) -> Optional[Union[List, pd.DataFrame]]:
+def read_visum_file(path: str, block_names: Optional[Union[List, str]], capture_stderr: bool = False,
+                    **kwargs) -> Optional[Union[List, pd.DataFrame]]:
     """
     Reads the net file from given path.
     :param path: path of the Visum net/att file
     :param block_names: str or list for table names within file to be read.
+    :param capture_stderr: capture the messages pandas writes to stderr and print them.
+    :param kwargs: any other arguments to be used within read_csv. header, names and skiprows are not allowed - the
+        column names are taken from the block header, ValueError is raised for them.
     :return: a dataframe or list of dataframes.
     """
     # Open net/att file.
@@ -58,57 +105,177 @@ def read_visum_file(path: str, block_names: Optional[Union[List, str]], **kwargs
         block_names = [block_names]
         list_required = False
 
-    number_of_blocks = len(block_names)
-    found_block = [False] * number_of_blocks
-    data = [pd.DataFrame([])] * number_of_blocks
-    with _bom_aware_open(path) as file:
-        file_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
-        while False in found_block:
-            # search for the beginning of a table - first sign is a $
-            dollar_sign_index = file_map.find(b"$")
-            if dollar_sign_index == -1:
-                break
+    with VisumFileReader(path) as reader:
+        data = reader.read_blocks(block_names, capture_stderr=capture_stderr, **kwargs)
 
-            file_map.seek(dollar_sign_index)
-            line_with_dollar = file_map.readline()
-            for index, name in enumerate(block_names):
-                if f"${name}:" not in str(line_with_dollar):
-                    break
+    return data if list_required else data[0]
 
-                found_block[index] = True
 
-                # search for the end of this table - next table starts with a comment line this starts with *
-                start_sign_index = file_map.find(b"*")
+def read_visum_file_chunks(path: str, block_name: str, chunksize: int, **kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Reads a single block of the net file from given path in chunks.
+    :param path: path of the Visum net/att file
+    :param block_name: table name within file to be read.
+    :param chunksize: number of rows per chunk.
+    :param kwargs: any other arguments to be used within read_csv, except header, names and skiprows.
+    :return: an iterator over dataframes of at most chunksize rows. Nothing is yielded if the block is missing.
+    """
+    with VisumFileReader(path) as reader:
+        yield from reader.read_block_chunks(block_name, chunksize, **kwargs)
 
-                # be careful: sometimes a string within the table also contains a * - skip those lines here:
-                while start_sign_index != -1:
-                    file_map.seek(start_sign_index)
-                    line_with_star = file_map.readline()
-                    index_star = line_with_star.find(b"*")
-                    index_semicolon = line_with_star.find(b";")
-                    if index_semicolon == -1 and index_star in [0, 1]:
-                        break
 
-                    start_sign_index = file_map.find(b"*")
+class VisumFileReader:
+    """
+    Reads blocks of a Visum net/att file, which is opened and mapped only once.
+    Blocks are indexed on demand: the scan stops at the requested block and later continues from there, so the file
+    is scanned at most once however many blocks are read from it.
+    """
 
-                if start_sign_index == -1:
-                    start_sign_index = file_map.size()
+    def __init__(self, path: str):
+        """
+        :param path: path of the Visum net/att file
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._file_map = _map_file(self._file)
+        except Exception:
+            self._file.close()
+            raise
+
+        # offset of the header, offset of the first row, end offset and raw column names by upper case block name
+        self._index: Dict[bytes, Tuple[int, int, int, bytes]] = {}
+        # where the scan continues, None once the whole file is indexed
+        self._scan_position: Optional[int] = 0
+        self._arrow_map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._arrow_map is not None:
+            self._arrow_map.close()
+        self._file_map.close()
+        self._file.close()
+
+    @property
+    def block_names(self) -> List[str]:
+        """
+        :return: names of all blocks within the file, in file order.
+        """
+        self._scan_blocks()
+        return [name.decode("ascii") for name in self._index]
 
-                # now we have beginning and end of the table within the file - read table as CSV
-                count = start_sign_index - dollar_sign_index
-                file_map.seek(dollar_sign_index)
-                _df = _read_csv_file(io.BytesIO(file_map.read(count)), sep=";", **kwargs)
-                if isinstance(_df, TextFileReader):
-                    df_block = pd.concat(chunk for chunk in _df)
-                    _df.close()
-                else:
-                    df_block = _df
+    def read_block(self, block_name: str, capture_stderr: bool = False, **kwargs) -> pd.DataFrame:
+        """
+        Reads a single block of the file.
+        :param block_name: table name within file to be read.
+        :param capture_stderr: capture the messages pandas writes to stderr and print them.
+        :param kwargs: any other arguments to be used within read_csv, except header, names and skiprows.
+        :return: a dataframe. Empty if the block is missing.
+        """
+        return self.read_blocks([block_name], capture_stderr=capture_stderr, **kwargs)[0]
 
-                df_block.columns = map(lambda x, table_name=name: x.split(f"${table_name.upper()}:")[-1], df_block.columns)
+    def read_blocks(self, block_names: List[str], capture_stderr: bool = False, **kwargs) -> List[pd.DataFrame]:
+        """
+        Reads several blocks of the file. With pyarrow available, the blocks are parsed in parallel.
+        :param block_names: table names within file to be read.
+        :param capture_stderr: capture the messages pandas writes to stderr and print them.
+        :param kwargs: any other arguments to be used within read_csv, except header, names and skiprows.
+        :return: a dataframe for each block. Empty if the block is missing.
+        """
+        _check_read_kwargs(kwargs)
+        blocks = [self._find_block(block_name) for block_name in block_names]
+        df_blocks = [None] * len(blocks)
+        found = [index for index, block in enumerate(blocks) if block is not None]
+        if pa is not None and not kwargs and found:
+            # pyarrow gets a map of its own - its reader threads may still hold the buffer when read_csv returns,
+            # which would prevent closing the file map
+            if self._arrow_map is None:
+                self._arrow_map = pa.memory_map(self.path)
+
+            if len(found) == 1:
+                _, rows_start, block_end, columns = blocks[found[0]]
+                df_blocks[found[0]] = _read_arrow_block(self._arrow_map, rows_start, block_end, columns)
+            else:
+                # pyarrow releases the GIL while parsing - parse one block per thread instead of one block on all threads
+                with ThreadPoolExecutor(max_workers=min(len(found), os.cpu_count() or 1)) as pool:
+                    futures = {index: pool.submit(_read_arrow_block, self._arrow_map, *blocks[index][1:],
+                                                  use_threads=False)
+                               for index in found}
+                for index, future in futures.items():
+                    df_blocks[index] = future.result()
+
+        data = []
+        for block, df_block in zip(blocks, df_blocks):
+            if block is None:
+                data.append(pd.DataFrame([]))
+                continue
 
-                data[index] = df_block
+            # now we have beginning and end of the table within the file - read table as CSV
+            if df_block is None:
+                # pandas gets the header line as well and skips it, so the line numbers of warnings count from it
+                header_start, _, block_end, columns = block
+                df_block = _read_csv_file(io.BytesIO(self._file_map[header_start:block_end]), capture_stderr, sep=";",
+                                          header=None, names=columns, skiprows=1, **kwargs)
+            data.append(df_block)
 
-    return data if list_required else data[0]
+        return data
+
+    def read_block_chunks(self, block_name: str, chunksize: int, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Reads a single block of the file in chunks.
+        :param block_name: table name within file to be read.
+        :param chunksize: number of rows per chunk.
+        :param kwargs: any other arguments to be used within read_csv, except header, names and skiprows.
+        :return: an iterator over dataframes of at most chunksize rows. Nothing is yielded if the block is missing.
+        """
+        _check_read_kwargs(kwargs)
+        block = self._find_block(block_name)
+        if block is None:
+            return
+
+        header_start, _, block_end, columns = block
+        with pd.read_csv(io.BytesIO(self._file_map[header_start:block_end]), sep=";", header=None, names=columns,
+                         skiprows=1, chunksize=chunksize, **_CSV_OPTIONS, **kwargs) as file_reader:
+            yield from file_reader
+
+    def _find_block(self, block_name: str) -> Optional[Tuple[int, int, int, List[str]]]:
+        name = block_name.upper().encode("ascii")
+        if name not in self._index:
+            self._scan_blocks(name)
+        if name not in self._index:
+            return None
+
+        # only the headers of requested blocks are decoded, e.g. "$NODE:NO;NAME"
+        header_start, rows_start, block_end, header = self._index[name]
+        columns = _unique_column_names(column.strip() for column in header.decode("utf-8").split(";"))
+        return header_start, rows_start, block_end, columns
+
+    def _scan_blocks(self, wanted: Optional[bytes] = None):
+        """
+        Indexes the blocks of the file, continuing after the last indexed block.
+        :param wanted: upper case name of the block to stop at. None indexes the rest of the file.
+        :return:
+        """
+        # walk from block to block - the search for the next header continues after the end of the last table
+        while self._scan_position is not None:
+            header = _HEADER_RE.search(self._file_map, self._scan_position)
+            if header is None:
+                self._scan_position = None
+                break
+
+            block_end = _find_block_end(self._file_map, header.end())
+            self._scan_position = block_end
+            name = header.group(1).upper()
+            # the first one wins if a block name occurs repeatedly
+            if name not in self._index:
+                self._index[name] = (header.start(), min(header.end() + 1, block_end), block_end, header.group(2))
+                if name == wanted:
+                    break
 
 
 def export_visum_file(dfs, path_out: str, block_names: Optional[Union[List, str]], file_type: str, mode="w"):
@@ -126,88 +293,206 @@ def export_visum_file(dfs, path_out: str, block_names: Optional[Union[List, str]
         dfs = [dfs]
         block_names = [block_names]
 
-    now = datetime.datetime.now()
-    datetime_string = now.strftime('%d/%m/%Y')
-
-    dfs = _replace_invalid_visum_chars(dfs)
-
     # create dir if missing
     base_path, _ = os.path.split(path_out)
-    if not os.path.exists(base_path):
-        os.makedirs(base_path)
+    if base_path:
+        os.makedirs(base_path, exist_ok=True)
 
-    with open(path_out, mode, encoding='utf-8-sig') as file:
+    # large buffer for few write calls. pandas and pyarrow already write "\n" - no newline translation needed
+    with open(path_out, mode, encoding='utf-8-sig', buffering=_WRITE_BUFFER_SIZE, newline='') as file:
         # if mode is 'w', header block is inserted first. It's skipped otherwise.
         if mode == 'w':
-            file.write(f'$VISION\n* {datetime_string}\n$VERSION:VERSNR;FILETYPE;LANGUAGE;UNIT\n')
-            file.write(f'\n10.000;{file_type};ENG;KM\n\n')
+            file.write(_header_block(file_type, datetime.date.today()))
         # iterate through the df, tableName, netObject and write them to file.
         for df_out, table_name, netObject in zip(dfs, block_names, block_names):
             attr_names = ";".join(df_out.columns).upper()
             file.write(f'*\n* Table: {table_name}\n*\n${netObject}:{attr_names}\n')
-            df_out.to_csv(file, ";", mode="a", index=False, header=False, lineterminator='\n',
-                          encoding='utf-8', quoting=csv.QUOTE_NONE, quotechar="", escapechar="")
+            if pa is not None and _is_numeric_frame(df_out):
+                try:
+                    table = pa.Table.from_pandas(df_out, preserve_index=False)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError, ValueError):
+                    # e.g. repeated column names, which pyarrow rejects - pandas writes them
+                    table = None
+
+                if table is not None:
+                    # numeric blocks need no escaping - let pyarrow format the rows to the underlying binary stream
+                    file.flush()
+                    pa_csv.write_csv(table, file.buffer,
+                                     write_options=pa_csv.WriteOptions(include_header=False, delimiter=";"))
+                    continue
+
+            # invalid characters are replaced on a copy of the string columns, one chunk of rows at a time.
+            # columns are addressed by position - names may repeat
+            string_columns = [index for index in range(df_out.shape[1]) if _holds_strings(df_out.iloc[:, index])]
+            for chunk_start in range(0, max(len(df_out), 1), _WRITE_CHUNK_SIZE):
+                df_chunk = df_out.iloc[chunk_start:chunk_start + _WRITE_CHUNK_SIZE]
+                if string_columns:
+                    df_chunk = df_chunk.copy(deep=False)
+                    for index in string_columns:
+                        df_chunk.isetitem(index, _replace_invalid_visum_chars(df_chunk.iloc[:, index]))
+                df_chunk.to_csv(file, sep=";", mode="a", index=False, header=False, lineterminator='\n',
+                                encoding='utf-8', quoting=csv.QUOTE_NONE, quotechar="", escapechar=None)
+
+
+def _holds_strings(column: pd.Series) -> bool:
+    return pd.api.types.infer_dtype(column, skipna=True) in ("string", "mixed", "mixed-integer")
+
+
+def _replace_invalid_visum_chars(column: pd.Series) -> pd.Series:
+    # the .str accessor turns non-string values into NaN - only use it on columns holding nothing but strings
+    if pd.api.types.infer_dtype(column, skipna=True) == "string":
+        return column.str.translate(_VISUM_CHAR_TABLE)
+
+    return column.map(lambda x: x.translate(_VISUM_CHAR_TABLE) if isinstance(x, str) else x)
 
 
-@contextmanager
-def _bom_aware_open(file_name: str, mode="r", **kwargs):
-    encoding = _get_encoding(file_name)
-    with open(file_name, mode, encoding=encoding, **kwargs) as file_stream:
-        yield file_stream
+@functools.lru_cache(maxsize=8)
+def _header_block(file_type: str, date: datetime.date) -> str:
+    # identical for all exports of a file type on the same day
+    return (f'$VISION\n* {date.strftime("%d/%m/%Y")}\n$VERSION:VERSNR;FILETYPE;LANGUAGE;UNIT\n'
+            f'\n10.000;{file_type};ENG;KM\n\n')
 
 
-def _get_encoding(file_name: str) -> str:
-    with open(file_name, "rb") as file_stream:
-        is_utf8 = file_stream.read(3) == codecs.BOM_UTF8
+def _is_numeric_frame(dataframe: pd.DataFrame) -> bool:
+    return all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+               and not pd.api.types.is_complex_dtype(dtype) for dtype in dataframe.dtypes)
 
-    return "utf-8-sig" if is_utf8 else "ansi"
 
+def _map_file(binary_stream: BinaryIO) -> mmap.mmap:
+    # no text layer needed here - the blocks are decoded when they are read as CSV
+    return mmap.mmap(binary_stream.fileno(), 0, access=mmap.ACCESS_READ)
 
-def _read_csv_file(data, **kwargs):
+
+def _find_block_end(file_map: mmap.mmap, position: int) -> int:
+    """
+    Searches the end of the block whose header line ends at the given position.
+    :param file_map: file map of the Visum net/att file.
+    :param position: offset of the line break after the block header.
+    :return: offset of the comment line ending the block, the file size if the block is the last one.
+    """
+    while True:
+        star = file_map.find(b"\n*", position)
+        if star == -1:
+            return file_map.size()
+
+        # a row starting with "*" within a string is no comment - rows of the table contain a ";"
+        line_end = file_map.find(b"\n", star + 1)
+        if line_end == -1:
+            line_end = file_map.size()
+        if file_map.find(b";", star + 1, line_end) == -1:
+            return star + 1
+        position = line_end
+
+
+def _unique_column_names(columns) -> List[str]:
+    # name the columns like pandas does when it parses the header: "NO", "NO.1" for repeated names, skipping names
+    # taken by other columns, and "Unnamed: 2" for empty names
+    header = [column or f"Unnamed: {index}" for index, column in enumerate(columns)]
+    counts = {}
+    for index, column in enumerate(header):
+        original = column
+        count = counts.get(column, 0)
+        while count > 0:
+            counts[original] = count + 1
+            column = f"{original}.{count}"
+            count = count + 1 if column in header else counts.get(column, 0)
+        header[index] = column
+        counts[column] = count + 1
+
+    return header
+
+
+def _read_arrow_block(arrow_map, rows_start: int, block_end: int, columns: List[str],
+                      use_threads=True) -> Optional[pd.DataFrame]:
+    """
+    Reads a block with pyarrow's CSV reader directly from the memory map, without copying it first.
+    :param arrow_map: pyarrow memory map of the Visum net/att file.
+    :param rows_start: offset of the first row after the block header.
+    :param block_end: offset of the end of the block.
+    :param columns: column names of the block.
+    :param use_threads: parse the block on multiple threads.
+    :return: a dataframe, None if pyarrow cannot parse the block like pandas - e.g. because of bad lines.
+    """
+    buffer = arrow_map.read_at(block_end - rows_start, rows_start)
+    read_options = pa_csv.ReadOptions(use_threads=use_threads, column_names=columns)
+    parse_options = pa_csv.ParseOptions(delimiter=";")
+    try:
+        table = pa_csv.read_csv(pa.BufferReader(buffer), read_options=read_options, parse_options=parse_options,
+                                convert_options=_arrow_convert_options())
+        # pandas does not infer dates and times - keep the text of those columns like pandas does
+        temporal_columns = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+        if temporal_columns:
+            table = pa_csv.read_csv(pa.BufferReader(buffer), read_options=read_options, parse_options=parse_options,
+                                    convert_options=_arrow_convert_options(temporal_columns))
+    except pa.ArrowInvalid:
+        return None
+
+    nullable_bool_columns = []
+    for index, field in enumerate(table.schema):
+        # text which is no valid UTF-8 is binary for pyarrow - pandas raises for it
+        if pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type):
+            return None
+        # pandas skips spaces after a separator (skipinitialspace), pyarrow keeps them. Such values are read as
+        # strings by pyarrow, whatever their type
+        if pa.types.is_string(field.type) and pa_compute.any(pa_compute.starts_with(table.column(index), " ")).as_py():
+            return None
+        # pyarrow reads integers beyond int64 as double, pandas as uint64 - let pandas decide
+        if pa.types.is_floating(field.type) and (pa_compute.max(table.column(index)).as_py() or 0) >= 2 ** 63:
+            return None
+        # columns without any value are float NaN in pandas
+        if pa.types.is_null(field.type):
+            table = table.set_column(index, field.name, table.column(index).cast(pa.float64()))
+        elif pa.types.is_boolean(field.type) and table.column(index).null_count:
+            nullable_bool_columns.append(field.name)
+
+    df_block = table.to_pandas(split_blocks=True, self_destruct=True)
+    # missing values of boolean columns are NaN in pandas, not None
+    for column in nullable_bool_columns:
+        df_block[column] = df_block[column].where(df_block[column].notna(), float("nan"))
+    return df_block
+
+
+def _arrow_convert_options(string_columns: Optional[List[str]] = None):
+    # same missing and boolean values as pandas' defaults
+    return pa_csv.ConvertOptions(column_types={column: pa.string() for column in string_columns or []},
+                                 null_values=_PANDAS_NA_VALUES, strings_can_be_null=True,
+                                 true_values=["True", "TRUE", "true"], false_values=["False", "FALSE", "false"])
+
+
+def _check_read_kwargs(kwargs: dict):
+    # the reader passes the column names of the block header itself
+    reserved = sorted({"header", "names", "skiprows"} & kwargs.keys())
+    if reserved:
+        raise ValueError(f"{', '.join(reserved)} cannot be passed to read a Visum block - the column names are "
+                         f"taken from the block header")
+
+
+def _read_csv_file(data, capture_stderr: bool = False, **kwargs):
     """
         Read the csv file and log the errors.
         :param data: data for constructing dataframe. e.g. str for path of the import file, or buffer reader.
-        :param feedbackWrapper: The feedback wrapper object.
+        :param capture_stderr: capture the messages pandas writes to stderr and print them.
         :param kwargs: any other arguments to be used within read_csv.
-        :return: a text file reader.
+            Chunked reads are not supported, "chunksize" and "iterator" are ignored. Use read_visum_file_chunks instead.
+        :return: a dataframe.
         """
+    kwargs.pop("chunksize", None)
+    kwargs.pop("iterator", None)
     try:
-        std_err_log = io.StringIO()
-        with redirect_stderr(std_err_log):
-            file_reader = pd.read_csv(data,
-                                      encoding='UTF-8',
-                                      skipinitialspace=True,
-                                      on_bad_lines="warn",
-                                      **kwargs)
-            error_messages = std_err_log.getvalue()
-            if error_messages and isinstance(error_messages, str) and error_messages != '':
-                print(error_messages)
+        if not capture_stderr:
+            return pd.read_csv(data, **_CSV_OPTIONS, **kwargs)
+
+        # sys.stderr is process wide - only one capture at a time, which allows to reuse the buffer
+        with _std_err_lock, redirect_stderr(_std_err_log):
+            _std_err_log.seek(0)
+            _std_err_log.truncate()
+            file_reader = pd.read_csv(data, **_CSV_OPTIONS, **kwargs)
+            error_messages = _std_err_log.getvalue()
+
+        if error_messages:
+            print(error_messages)
 
         return file_reader
     except Exception as err:
         mess = f"Error reading CSV file {data}: {str(err)}"
         raise Exception(mess) from err
-
-
-def _replace_invalid_visum_chars(dataframes: List[pd.DataFrame]) -> List[pd.DataFrame]:
-    """
-    Replace invalid Visum characters from string column values.
-    :param dataframes: List of DataFrames containing Visum net objects.
-    :return: List of DataFrames without invalid characters in string column values
-    """
-    results = []
-
-    for dataframe in dataframes:
-        for column in dataframe.columns:
-            try:
-                if len(dataframe[column]) > 0 and isinstance(dataframe[column][0], str):
-                    mask1 = dataframe[column].astype(str).str.contains("$", na=False, regex=False)
-                    mask2 = dataframe[column].astype(str).str.contains(";", na=False, regex=False)
-                    dataframe.loc[mask1, column] = dataframe.loc[mask1, column].apply(lambda x: x.replace("$", "§"))
-                    dataframe.loc[mask2, column] = dataframe.loc[mask2, column].apply(lambda x: x.replace(";", ","))
-            except Exception:
-                continue
-
-        results.append(dataframe)
-
-    return results
@@ -0,0 +1,296 @@
+import datetime
+import sys
+import warnings
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from PSLibrary import helpers
+
+NET_FILE = (
+    "$VISION\n"
+    "*\n"
+    "$TIMEPROFILEITEM:LINENAME;INDEX;ARR;DEP;DATE;STAMP;FLAG;EMPTY\n"
+    "L1;1;00:02:00;00:03:00;2024-01-01;2024-01-01 10:00;True;\n"
+    "L1;2;00:05:00;00:06:00;2024-01-02;2024-01-02 11:00;False;NA\n"
+    "*\n"
+    "$NODE:NO;NAME\n"
+    "1; Main St\n"
+    "2;None\n"
+)
+
+
+def test_arrow_and_pandas_path_read_the_same(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "sample.net"
+    path.write_text(NET_FILE, encoding="utf-8")
+
+    df_arrow = helpers.read_visum_file(str(path), ["TIMEPROFILEITEM", "NODE"])
+    monkeypatch.setattr(helpers, "pa", None)
+    df_pandas = helpers.read_visum_file(str(path), ["TIMEPROFILEITEM", "NODE"])
+
+    for df_a, df_p in zip(df_arrow, df_pandas):
+        pd.testing.assert_frame_equal(df_a, df_p)
+    assert df_arrow[0]["ARR"].tolist() == ["00:02:00", "00:05:00"]
+    assert df_arrow[0]["DATE"].tolist() == ["2024-01-01", "2024-01-02"]
+    assert df_arrow[1]["NAME"].iloc[0] == "Main St"
+
+
+@pytest.mark.parametrize("rows", [b"1;True\n2;\n3;False\n", b"1;18446744073709551615\n2;3\n"])
+def test_arrow_and_pandas_path_type_the_same(tmp_path, monkeypatch, rows):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "types.net"
+    path.write_bytes(b"$NODE:NO;VALUE\n" + rows + b"*\n")
+
+    df_arrow = helpers.read_visum_file(str(path), "NODE")
+    monkeypatch.setattr(helpers, "pa", None)
+    df_pandas = helpers.read_visum_file(str(path), "NODE")
+
+    pd.testing.assert_frame_equal(df_arrow, df_pandas)
+
+
+def test_invalid_utf8_raises_on_both_paths(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "ansi.net"
+    path.write_bytes(b"$NODE:NO;NAME\n1;Stra\xdfe\n*\n")
+
+    with pytest.raises(Exception, match="utf-8"):
+        helpers.read_visum_file(str(path), "NODE")
+    monkeypatch.setattr(helpers, "pa", None)
+    with pytest.raises(Exception, match="utf-8"):
+        helpers.read_visum_file(str(path), "NODE")
+
+
+def test_block_directly_after_bom(tmp_path):
+    path = tmp_path / "bom.net"
+    path.write_text("$NODE:NO;NAME\n1;a\n*\n", encoding="utf-8-sig")
+
+    df_node = helpers.read_visum_file(str(path), "NODE")
+
+    assert df_node.to_dict("list") == {"NO": [1], "NAME": ["a"]}
+
+
+def test_repeated_attributes_are_renamed_like_pandas(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "dup.net"
+    path.write_text("$NODE:NO;NO;NAME;NO.1\n1;2;a;3\n*\n", encoding="utf-8")
+
+    df_arrow = helpers.read_visum_file(str(path), "NODE")
+    monkeypatch.setattr(helpers, "pa", None)
+    df_pandas = helpers.read_visum_file(str(path), "NODE")
+
+    assert list(df_pandas.columns) == ["NO", "NO.2", "NAME", "NO.1"]
+    pd.testing.assert_frame_equal(df_arrow, df_pandas)
+
+
+def test_only_requested_headers_are_decoded(tmp_path):
+    path = tmp_path / "ansi.net"
+    path.write_bytes(b"$NODE:NO\n1\n*\n$MAINNODE:NO;N\xc4ME\n1;a\n*\n")
+
+    with helpers.VisumFileReader(str(path)) as reader:
+        df_node = reader.read_block("NODE")
+        assert reader._scan_position is not None
+
+    assert df_node["NO"].tolist() == [1]
+
+
+def test_export_repeated_string_columns(tmp_path):
+    path = tmp_path / "dup_out.net"
+    df = pd.DataFrame([[1, "a$b", "c;d"]], columns=["NO", "NAME", "NAME"])
+
+    helpers.export_visum_file(df, str(path), "NODE", "Net")
+
+    assert path.read_text(encoding="utf-8-sig").endswith("$NODE:NO;NAME;NAME\n1;a§b;c,d\n")
+    assert df.iloc[0].tolist() == [1, "a$b", "c;d"]
+
+
+def test_export_repeated_numeric_columns(tmp_path):
+    path = tmp_path / "dup_num.net"
+
+    helpers.export_visum_file(pd.DataFrame([[1, 2]], columns=["NO", "NO"]), str(path), "NODE", "Net")
+
+    assert path.read_text(encoding="utf-8-sig").endswith("$NODE:NO;NO\n1;2\n")
+
+
+def test_update_visum_table_passes_python_row_tuples():
+    calls = []
+    table = SimpleNamespace(TableEntries=SimpleNamespace(
+        SetMultipleAttributes=lambda attributes, values: calls.append((list(attributes), values))))
+    visum = SimpleNamespace(Net=SimpleNamespace(TableDefinitions=SimpleNamespace(ItemByKey=lambda name: table)),
+                            Log=lambda priority, message: None)
+
+    helpers.update_visum_table(visum, "test", "TABLE", pd.DataFrame({"NO": [1, 2], "VALUE": [0.5, 1.5]}))
+
+    assert calls == [(["NO", "VALUE"], [(1, 0.5), (2, 1.5)])]
+    assert [type(value) for value in calls[0][1][0]] == [int, float]
+
+
+def test_bad_lines_are_counted_from_the_block_header(tmp_path):
+    path = tmp_path / "bad.net"
+    path.write_text("$VISION\n*\n$NODE:NO;NAME\n1;a\n2;b;c\n*\n", encoding="utf-8")
+
+    with pytest.warns(pd.errors.ParserWarning, match="Skipping line 3"):
+        df_node = helpers.read_visum_file(str(path), "NODE")
+
+    assert df_node["NO"].tolist() == [1]
+
+
+@pytest.mark.parametrize("kwargs", [{"header": 0}, {"names": ["A", "B"]}, {"skiprows": 1}])
+def test_header_kwargs_are_rejected(tmp_path, kwargs):
+    path = tmp_path / "sample.net"
+    path.write_text(NET_FILE, encoding="utf-8")
+
+    with pytest.raises(ValueError, match="block header"):
+        helpers.read_visum_file(str(path), "NODE", **kwargs)
+
+
+def test_export_escapes_invalid_visum_chars(tmp_path):
+    path = tmp_path / "escaped.net"
+    df = pd.DataFrame({"NO": [1, 2], "NAME": ["a$b", "c;d"], "CODE": ["x;y", 3]})
+
+    helpers.export_visum_file(df, str(path), "NODE", "Net")
+
+    assert path.read_text(encoding="utf-8-sig").endswith("$NODE:NO;NAME;CODE\n1;a§b;x,y\n2;c,d;3\n")
+    assert df["NAME"].tolist() == ["a$b", "c;d"]
+
+
+def test_export_arrow_and_to_csv_write_the_same_values(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"NO": [1, 2, 3], "LENGTH": [0.5, float("nan"), 1e-7], "V": [1e11, 2.25, -3.0]})
+
+    helpers.export_visum_file(df, str(tmp_path / "arrow.net"), "LINK", "Net")
+    monkeypatch.setattr(helpers, "pa", None)
+    helpers.export_visum_file(df, str(tmp_path / "pandas.net"), "LINK", "Net")
+
+    # pyarrow formats floats differently, e.g. "-3" instead of "-3.0"
+    df_arrow = helpers.read_visum_file(str(tmp_path / "arrow.net"), "LINK")
+    df_pandas = helpers.read_visum_file(str(tmp_path / "pandas.net"), "LINK")
+    pd.testing.assert_frame_equal(df_arrow, df)
+    pd.testing.assert_frame_equal(df_pandas, df)
+
+
+def test_export_appends_blocks_without_header(tmp_path):
+    path = tmp_path / "append.net"
+
+    helpers.export_visum_file(pd.DataFrame({"NO": [1]}), str(path), "NODE", "Net")
+    helpers.export_visum_file(pd.DataFrame({"NO": [2], "NAME": ["b"]}), str(path), "ZONE", "Net", mode="a+")
+
+    text = path.read_text(encoding="utf-8-sig")
+    assert text.count("$VISION") == 1
+    assert "\ufeff" not in text
+    assert helpers.read_visum_file(str(path), ["NODE", "ZONE"])[1].to_dict("list") == {"NO": [2], "NAME": ["b"]}
+
+
+def test_export_header_is_cached_per_day(tmp_path):
+    helpers._header_block.cache_clear()
+
+    for file_name in ("first.net", "second.net"):
+        helpers.export_visum_file(pd.DataFrame({"NO": [1]}), str(tmp_path / file_name), "NODE", "Att")
+
+    assert helpers._header_block.cache_info().hits == 1
+    assert (tmp_path / "second.net").read_text(encoding="utf-8-sig").startswith(
+        f"$VISION\n* {datetime.date.today():%d/%m/%Y}\n$VERSION:VERSNR;FILETYPE;LANGUAGE;UNIT\n\n10.000;Att;ENG;KM\n")
+
+
+def test_export_to_bare_file_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    helpers.export_visum_file(pd.DataFrame({"NO": [1]}), "bare.net", "NODE", "Net")
+
+    assert (tmp_path / "bare.net").exists()
+
+
+def test_export_into_missing_directory(tmp_path):
+    path = tmp_path / "new" / "dir" / "out.net"
+
+    helpers.export_visum_file(pd.DataFrame({"NO": [1]}), str(path), "NODE", "Net")
+
+    assert path.exists()
+
+
+def test_export_read_round_trip(tmp_path):
+    path = tmp_path / "round_trip.net"
+    df_node = pd.DataFrame({"NO": [1, 2], "NAME": ["Main St", "Köln"], "XCOORD": [0.5, 1.25]})
+    df_link = pd.DataFrame({"NO": [10], "FROMNODENO": [1], "TONODENO": [2]})
+
+    helpers.export_visum_file([df_node, df_link], str(path), ["NODE", "LINK"], "Net")
+
+    for df_in, df_out in zip(helpers.read_visum_file(str(path), ["NODE", "LINK"]), [df_node, df_link]):
+        pd.testing.assert_frame_equal(df_in, df_out)
+
+
+
+def test_reader_reads_blocks_of_one_mapped_file(tmp_path):
+    path = tmp_path / "sample.net"
+    path.write_text(NET_FILE, encoding="utf-8")
+
+    reader = helpers.VisumFileReader(str(path))
+    with reader:
+        assert reader.read_block("node")["NO"].tolist() == [1, 2]
+        assert reader.read_block("LINK").empty
+        assert reader.block_names == ["TIMEPROFILEITEM", "NODE"]
+
+    assert reader._file.closed
+    assert reader._file_map.closed
+
+
+def test_read_visum_file_chunks(tmp_path):
+    path = tmp_path / "sample.net"
+    path.write_text("$NODE:NO;NAME\n1;a\n2;b\n3;c\n*\n", encoding="utf-8")
+
+    chunks = list(helpers.read_visum_file_chunks(str(path), "NODE", 2))
+
+    assert [chunk.to_dict("list") for chunk in chunks] == [{"NO": [1, 2], "NAME": ["a", "b"]},
+                                                          {"NO": [3], "NAME": ["c"]}]
+    assert list(helpers.read_visum_file_chunks(str(path), "LINK", 2)) == []
+
+
+def test_blocks_are_parsed_on_a_thread_pool(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "sample.net"
+    path.write_text(NET_FILE + "*\n$LINK:NO;LENGTH\n1;0.5\n", encoding="utf-8")
+    pools = []
+
+    class RecordingPool(helpers.ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(helpers, "ThreadPoolExecutor", RecordingPool)
+    df_blocks = helpers.read_visum_file(str(path), ["TIMEPROFILEITEM", "LINK", "NODE"])
+
+    assert len(pools) == 1
+    assert [len(df_block) for df_block in df_blocks] == [2, 1, 2]
+    assert df_blocks[1]["LENGTH"].tolist() == [0.5]
+
+
+def test_capture_stderr_prints_parser_messages(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "bad.net"
+    path.write_text("$NODE:NO;NAME\n1;a\n2;b;c\n*\n", encoding="utf-8")
+    # write warnings to the current stderr, as python does outside of pytest
+    monkeypatch.setattr(warnings, "showwarning", lambda message, category, filename, lineno, file=None, line=None:
+                        sys.stderr.write(warnings.formatwarning(message, category, filename, lineno, line)))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("always")
+        df_node = helpers.read_visum_file(str(path), "NODE", capture_stderr=True)
+
+    captured = capsys.readouterr()
+    assert "Skipping line 3" in captured.out
+    assert captured.err == ""
+    assert df_node["NO"].tolist() == [1]
+
+
+def test_update_visum_table_recreates_entries():
+    calls = []
+    entries = SimpleNamespace(RemoveAll=lambda: calls.append("RemoveAll"),
+                              SetMultipleAttributes=lambda attributes, values: calls.append(values))
+    table = SimpleNamespace(TableEntries=entries, AddMultiTableEntries=lambda count: calls.append(count))
+    visum = SimpleNamespace(Net=SimpleNamespace(TableDefinitions=SimpleNamespace(ItemByKey=lambda name: table)),
+                            Log=lambda priority, message: None)
+
+    helpers.update_visum_table(visum, "test", "TABLE", pd.DataFrame({"NAME": ["a", "b"]}), attributes=["CODE"],
+                               remove_entries=True)
+
+    assert calls == ["RemoveAll", 2, [("a",), ("b",)]]